@@ -1,13 +1,21 @@
 import os
 import time
+import hashlib
+from io import BytesIO
 from datetime import timedelta
-from flask import Flask, request, jsonify, session, redirect
+from flask import Flask, request, jsonify, session, redirect, Response
 from flask_cors import CORS, cross_origin
 from spotipy.oauth2 import SpotifyPKCE
 import spotipy
 from shared_constants import *
 import logging
 from spotipy.exceptions import SpotifyException
+from image_cache import ImageCache
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
 
 logging.basicConfig(
     filename='backend.log',
@@ -633,16 +641,9 @@ def proxy_image():
             response = jsonify({'error': 'No image_url provided'}), 400
             return add_cors_headers(response[0])
         
-        import requests
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        
-        img_response = requests.get(image_url, headers=headers, timeout=10)
-        img_response.raise_for_status()
+        image_data = fetch_image_bytes(image_url)
         
-        from flask import Response
-        response = Response(img_response.content, mimetype=img_response.headers.get('content-type', 'image/jpeg'))
+        response = Response(image_data, mimetype=image_mimetype(image_data))
         response = add_cors_headers(response)
         
         return response
@@ -673,22 +674,16 @@ def download_album_cover():
             response = jsonify({'error': 'No image_url provided'}), 400
             return add_cors_headers(response[0])
         
-        import requests
         import base64
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        
-        img_response = requests.get(image_url, headers=headers, timeout=10)
-        img_response.raise_for_status()
+        image_bytes = fetch_image_bytes(image_url)
         
-        image_data = base64.b64encode(img_response.content).decode('utf-8')
+        image_data = base64.b64encode(image_bytes).decode('utf-8')
         
         response = jsonify({
             'status': 200,
             'data': image_data,
-            'content_type': img_response.headers.get('content-type', 'image/jpeg'),
-            'size': len(img_response.content)
+            'content_type': image_mimetype(image_bytes),
+            'size': len(image_bytes)
         })
         response = add_cors_headers(response)
         
@@ -698,5 +693,101 @@ def download_album_cover():
         response = jsonify({'error': f'Failed to download album cover: {str(e)}'}), 500
         return add_cors_headers(response[0])
 
+# Covers served by /cover are keyed by (source URL, size). Spotify image URLs
+# are content-addressed, so the response for a key never changes and can be
+# cached by browsers and CDNs indefinitely.
+COVER_MAX_SIZE = 640
+COVER_JPEG_QUALITY = 85
+COVER_CACHE_MAX_AGE = 60 * 60 * 24 * 365
+ALLOWED_IMAGE_HOSTS = ('.scdn.co', '.spotifycdn.com')
+IMAGE_REQUEST_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+def is_allowed_image_url(image_url):
+    """Only Spotify's image CDNs may be fetched through /cover"""
+    from urllib.parse import urlparse
+    parsed = urlparse(image_url)
+    host = parsed.hostname or ''
+    return parsed.scheme == 'https' and any(host.endswith(suffix) for suffix in ALLOWED_IMAGE_HOSTS)
+
+image_cache = ImageCache()
+upstream_session = None
+
+def download_image(image_url):
+    global upstream_session
+    if upstream_session is None:
+        import requests
+        upstream_session = requests.Session()
+        upstream_session.headers.update(IMAGE_REQUEST_HEADERS)
+    img_response = upstream_session.get(image_url, timeout=10)
+    img_response.raise_for_status()
+    return img_response.content
+
+def fetch_image_bytes(image_url):
+    """Returns the image at image_url, from the image cache when any request has fetched it before"""
+    return image_cache.get_or_fetch(f"source|{image_url}", lambda: download_image(image_url))
+
+def image_mimetype(image_data):
+    if image_data.startswith(b'\x89PNG'):
+        return 'image/png'
+    return 'image/jpeg'
+
+def resize_cover(image_data, target_width, target_height):
+    """Returns the image as JPEG bytes at the target size (requires Pillow)"""
+    with Image.open(BytesIO(image_data)) as image:
+        image = image.convert('RGB')
+        if image.size != (target_width, target_height):
+            image = image.resize((target_width, target_height), Image.LANCZOS)
+        output = BytesIO()
+        image.save(output, format='JPEG', quality=COVER_JPEG_QUALITY, optimize=True)
+    return output.getvalue()
+
+def cover_etag(image_url, target_width, target_height):
+    return hashlib.sha1(f"{image_url}|{target_width}x{target_height}|q{COVER_JPEG_QUALITY}".encode()).hexdigest()
+
+@app.route('/cover', methods=['GET', 'OPTIONS'])
+def cover():
+    """Serve an album cover resized to w x h as raw JPEG bytes with long-lived cache headers"""
+    if request.method == 'OPTIONS':
+        response = jsonify({'status': 'ok'})
+        response = add_cors_headers(response)
+        response.headers['Access-Control-Allow-Methods'] = 'GET, OPTIONS'
+        return response
+    
+    image_url = request.args.get('url')
+    try:
+        target_width = int(request.args.get('w', COVER_MAX_SIZE))
+        target_height = int(request.args.get('h', target_width))
+    except ValueError:
+        return add_cors_headers((jsonify({'error': 'w and h must be integers'}), 400))
+    
+    if not image_url or not is_allowed_image_url(image_url):
+        return add_cors_headers((jsonify({'error': 'url must be a Spotify image URL'}), 400))
+    if not (0 < target_width <= COVER_MAX_SIZE and 0 < target_height <= COVER_MAX_SIZE):
+        return add_cors_headers((jsonify({'error': f'w and h must be between 1 and {COVER_MAX_SIZE}'}), 400))
+    if Image is None:
+        # Without Pillow the original bytes can't be resized; serving them under
+        # this URL's ETag and immutable headers would pin the wrong image in caches
+        return add_cors_headers((jsonify({'error': 'Cover resizing is unavailable (Pillow is not installed)'}), 503))
+    
+    etag = cover_etag(image_url, target_width, target_height)
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        try:
+            image_data = image_cache.get_or_fetch(
+                f"cover|{image_url}|{target_width}x{target_height}|q{COVER_JPEG_QUALITY}",
+                lambda: resize_cover(fetch_image_bytes(image_url), target_width, target_height))
+        except Exception as e:
+            logging.warning(f"Cover fetch failed for {image_url}: {e}")
+            return add_cors_headers((jsonify({'error': f'Failed to load cover: {str(e)}'}), 502))
+        response = Response(image_data, mimetype='image/jpeg')
+    
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = f'public, max-age={COVER_CACHE_MAX_AGE}, immutable'
+    response.headers['Vary'] = 'Origin'
+    return add_cors_headers(response)
+
 if __name__ == '__main__':
     app.run(debug=True, port=5000, host='0.0.0.0') 
\ No newline at end of file
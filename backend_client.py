@@ -0,0 +1,284 @@
+import asyncio
+import json
+import os
+import sys
+import time
+
+# Every round trip to the Flask backend goes through BackendClient. In the
+# browser a request is a real fetch() whose promise is awaited directly, so
+# the calling task resumes the moment the response lands instead of sleeping
+# for a fixed interval and reading a window global. On desktop the same calls
+# run through a requests.Session in a worker thread.
+#
+# The browser side is a small runtime, window.spotisnake, installed once and
+# then called with plain arguments, so no JS source is generated per request.
+# Each request gets a unique id. Its slot in the runtime's request table
+# holds the fetch's AbortController and result, so any number of calls can be
+# in flight without sharing a global, and the slot is deleted (aborting the
+# fetch if it is still running) as soon as the Python side is done with it,
+# including on timeout or task cancellation.
+#
+# GETs are single-flight: concurrent callers asking for the same path share
+# one request, and callers that pass a ttl also reuse a successful response
+# for that long, so polling loops and back-to-back lookups cost one round trip.
+
+BACKEND_URL = os.environ.get("SPOTISNAKE_BACKEND_URL", "https://spotisnake.onrender.com")
+BACKEND_TIMEOUT = 10.0
+
+
+def in_browser():
+    return sys.platform == "emscripten"
+
+async def await_js_promise(promise):
+    """Awaits a JS promise from Python and returns the value it resolves to."""
+    if hasattr(promise, "__await__"):
+        return await promise
+
+    future = asyncio.get_event_loop().create_future()
+
+    def resolve(value):
+        if not future.done():
+            future.set_result(value)
+
+    def reject(error):
+        if not future.done():
+            future.set_exception(RuntimeError(str(error)))
+
+    promise.then(resolve, reject)
+    return await future
+
+RUNTIME_JS = '''
+if (!window.spotisnake) {
+    window.spotisnake = (() => {
+        const requests = {};
+        function open(id) {
+            const slot = { controller: new AbortController(), result: null };
+            requests[id] = slot;
+            return slot;
+        }
+        function settle(slot, result) {
+            slot.result = result;
+            return result;
+        }
+        function fetchJSON(method, path, body, id) {
+            const slot = open(id);
+            const options = { method: method, credentials: "include", signal: slot.controller.signal };
+            if (body != null) {
+                options.headers = { "Content-Type": "application/json" };
+                options.body = body;
+            }
+            return fetch(runtime.baseUrl + path, options)
+                .then(response => response.text().then(text => JSON.stringify({ status: response.status, text: text })))
+                .catch(error => JSON.stringify({ status: 0, error: error.toString() }))
+                .then(result => settle(slot, result));
+        }
+        function fetchBytes(path, id) {
+            const slot = open(id);
+            return fetch(runtime.baseUrl + path, { method: "GET", signal: slot.controller.signal })
+                .then(response => response.ok ? response.arrayBuffer().then(buffer => new Uint8Array(buffer)) : new Uint8Array(0))
+                .catch(error => new Uint8Array(0))
+                .then(result => settle(slot, result));
+        }
+        function release(id) {
+            const slot = requests[id];
+            if (slot) {
+                if (slot.result === null) slot.controller.abort();
+                delete requests[id];
+            }
+        }
+        function decodeImage(base64Data, width, height) {
+            return new Promise(resolve => {
+                const img = new Image();
+                img.onload = () => {
+                    const canvas = document.createElement("canvas");
+                    canvas.width = width;
+                    canvas.height = height;
+                    const ctx = canvas.getContext("2d");
+                    ctx.drawImage(img, 0, 0, width, height);
+                    resolve(ctx.getImageData(0, 0, width, height).data);
+                };
+                img.onerror = () => resolve(new Uint8Array(0));
+                img.src = "data:image/jpeg;base64," + base64Data;
+            });
+        }
+        const runtime = { baseUrl: "", requests: requests, fetchJSON: fetchJSON, fetchBytes: fetchBytes,
+                          release: release, decodeImage: decodeImage };
+        return runtime;
+    })();
+}
+'''
+
+def js_typed_array_to_bytes(typed_array):
+    """Copies a JS Uint8Array/Uint8ClampedArray into Python bytes in one transfer"""
+    if hasattr(typed_array, 'to_bytes'):
+        return typed_array.to_bytes()
+    if hasattr(typed_array, 'to_py'):
+        return bytes(typed_array.to_py())
+    return bytes(typed_array)
+
+
+class BackendResponse:
+    """Status and body text of a backend response; status 0 means the request never completed."""
+
+    def __init__(self, status, text="", error=None):
+        self.status = status
+        self.text = text
+        self.error = error
+
+    @property
+    def ok(self):
+        return 200 <= self.status < 300
+
+    def json(self):
+        """Returns the parsed body, or None if it isn't JSON."""
+        try:
+            return json.loads(self.text)
+        except (TypeError, ValueError):
+            return None
+
+
+class BackendClient:
+    """Makes requests to the backend, with the session cookie, and resolves when they complete."""
+
+    def __init__(self, base_url=BACKEND_URL, timeout=BACKEND_TIMEOUT):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.session = None
+        self.next_request_id = 0
+        self.in_flight = {}
+        self.installed = False
+        self.flights = {}
+        self.recent = {}
+
+    def url(self, path):
+        return f"{self.base_url}{path}"
+
+    def runtime(self):
+        """Returns window.spotisnake, installing it on first use."""
+        import js
+        if not self.installed:
+            js.eval(RUNTIME_JS)
+            js.window.spotisnake.baseUrl = self.base_url
+            self.installed = True
+        return js.window.spotisnake
+
+    def _register(self, method, path):
+        """Allocates a unique id for a request and records it as in flight."""
+        self.next_request_id += 1
+        request_id = f"r{self.next_request_id}"
+        self.in_flight[request_id] = f"{method} {path}"
+        return request_id
+
+    def _release(self, request_id):
+        """Forgets a finished or abandoned request and frees its browser slot."""
+        self.in_flight.pop(request_id, None)
+        if in_browser():
+            try:
+                self.runtime().release(request_id)
+            except Exception as e:
+                pass
+
+    def _session(self):
+        if self.session is None:
+            import requests
+            self.session = requests.Session()
+        return self.session
+
+    async def request(self, method, path, body=None):
+        """Sends a request and returns a BackendResponse once the whole body has arrived."""
+        request_id = self._register(method, path)
+        try:
+            if in_browser():
+                body_json = json.dumps(body) if body is not None else None
+                promise = self.runtime().fetchJSON(method, path, body_json, request_id)
+                result = json.loads(str(await asyncio.wait_for(await_js_promise(promise), self.timeout)))
+                return BackendResponse(result["status"], result.get("text", ""), result.get("error"))
+            response = await asyncio.to_thread(self._session().request, method, self.url(path),
+                                               json=body, timeout=self.timeout)
+            return BackendResponse(response.status_code, response.text)
+        except Exception as e:
+            print(f"DEBUG: backend_client.py - {method} {path} failed: {e}")
+            return BackendResponse(0, error=str(e))
+        finally:
+            self._release(request_id)
+
+    async def get(self, path, ttl=0):
+        """GETs path, sharing one request among concurrent callers.
+
+        With a ttl, a successful response is also reused for that many seconds;
+        without one, the caller always gets a response fetched after it asked.
+        """
+        if ttl:
+            cached = self.recent.get(path)
+            if cached is not None:
+                expires_at, response = cached
+                if time.monotonic() < expires_at:
+                    return response
+                del self.recent[path]
+
+        flight = self.flights.get(path)
+        if flight is None:
+            flight = asyncio.ensure_future(self.request("GET", path))
+            self.flights[path] = flight
+            flight.add_done_callback(lambda done: self._land(path, done))
+        # A caller giving up (e.g. a cancelled task) mustn't cancel the request for the others
+        response = await asyncio.shield(flight)
+        if ttl and response.ok:
+            self._remember(path, response, ttl)
+        return response
+
+    def _land(self, path, flight):
+        if self.flights.get(path) is flight:
+            del self.flights[path]
+
+    def _remember(self, path, response, ttl):
+        """Caches response for ttl seconds, keeping a longer expiry another caller already set."""
+        now = time.monotonic()
+        for expired in [key for key, (expires_at, _) in self.recent.items() if expires_at <= now]:
+            del self.recent[expired]
+        expires_at = now + ttl
+        cached = self.recent.get(path)
+        if cached is not None and cached[1] is response:
+            expires_at = max(expires_at, cached[0])
+        self.recent[path] = (expires_at, response)
+
+    def invalidate(self, path=None):
+        """Drops the cached response for path, or every cached response."""
+        if path is None:
+            self.recent.clear()
+        else:
+            self.recent.pop(path, None)
+
+    async def post(self, path, body=None):
+        return await self.request("POST", path, body)
+
+    async def get_json(self, path, ttl=0):
+        """Returns the parsed JSON body of a successful GET, or None."""
+        response = await self.get(path, ttl)
+        return response.json() if response.ok else None
+
+    async def get_bytes(self, path):
+        """Returns the raw body of a successful GET (e.g. an image), or None."""
+        request_id = self._register("GET", path)
+        try:
+            if in_browser():
+                promise = self.runtime().fetchBytes(path, request_id)
+                data = await asyncio.wait_for(await_js_promise(promise), self.timeout)
+                return js_typed_array_to_bytes(data) or None
+            response = await asyncio.to_thread(self._session().get, self.url(path), timeout=self.timeout)
+            if response.status_code == 200 and response.content:
+                return response.content
+            return None
+        except Exception as e:
+            print(f"DEBUG: backend_client.py - GET {path} failed: {e}")
+            return None
+        finally:
+            self._release(request_id)
+
+    async def decode_image(self, base64_data, width, height):
+        """Decodes base64 image data with the browser's decoder into packed RGBA bytes, or None."""
+        pixels = await await_js_promise(self.runtime().decodeImage(base64_data, width, height))
+        return js_typed_array_to_bytes(pixels) or None
+
+
+backend = BackendClient()
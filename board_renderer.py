@@ -0,0 +1,187 @@
+import itertools
+import pygame
+from shared_constants import *
+from sprites import FRUIT_PULSE_SIZES, get_animation
+
+
+# How many ticks between two frames can be repainted cell by cell; a bigger
+# gap (more than the scheduler's catch-up limit) redraws the whole screen
+TRACKED_TICKS = 8
+
+
+def cell_rect(cell):
+    """Returns the on-screen rect of a board cell."""
+    return pygame.Rect(cell[0] * GRID_SIZE, cell[1] * GRID_SIZE, GRID_SIZE, GRID_SIZE)
+
+def lerp_cell_rect(from_cell, to_cell, alpha):
+    """Returns the on-screen rect of a segment slid alpha of the way between two cells."""
+    x = from_cell[0] + (to_cell[0] - from_cell[0]) * alpha
+    y = from_cell[1] + (to_cell[1] - from_cell[1]) * alpha
+    return pygame.Rect(round(x * GRID_SIZE), round(y * GRID_SIZE), GRID_SIZE, GRID_SIZE)
+
+def piece_rect(piece):
+    """Returns the on-screen rect of an album piece."""
+    return pygame.Rect(piece[0] * ALBUM_GRID_SIZE, piece[1] * ALBUM_GRID_SIZE, ALBUM_GRID_SIZE, ALBUM_GRID_SIZE)
+
+class TileAtlas:
+    """An album cover used as a tile atlas: the one cover surface plus the source rect of every piece.
+
+    Pieces are blitted straight out of the cover, so nothing is sliced or
+    copied per piece.
+    """
+
+    def __init__(self, surface, tile_size):
+        self.surface = surface
+        self.tile_size = tile_size
+        self.cols = surface.get_width() // tile_size
+        self.rows = surface.get_height() // tile_size
+        self.tiles = {(col, row): pygame.Rect(col * tile_size, row * tile_size, tile_size, tile_size)
+                      for row in range(self.rows) for col in range(self.cols)}
+
+    def blit_tile(self, target, piece, dest):
+        """Draws one piece of the cover onto target at dest."""
+        target.blit(self.surface, dest, self.tiles[piece])
+
+def compose_album_layer(album_atlas=None, background=None):
+    """Draws the game background, with the whole album cover over it if an atlas is given, into one screen-sized surface."""
+    layer = pygame.Surface((width, height)).convert()
+    if background is None:
+        background = game_bg
+    if background:
+        layer.blit(background, (0, 0))
+    else:
+        layer.fill(LIGHT_GREY)
+    if album_atlas is not None:
+        layer.blit(album_atlas.surface, (0, 0))
+    return layer
+
+def fruit_rect(fruit, pulse):
+    """Returns the on-screen rect of the fruit at a given pulse size."""
+    return pygame.Rect(fruit[0] * GRID_SIZE - pulse // 2, fruit[1] * GRID_SIZE - pulse // 2,
+                       GRID_SIZE + pulse, GRID_SIZE + pulse)
+
+
+class BoardRenderer:
+    """Draws the in-game board, repainting and updating only the rects that changed.
+
+    Changes come from the snake's head and tail (and, when several ticks ran
+    in one frame, every cell the head entered or the tail left in between),
+    the fruit and its pulse,
+    album pieces revealed since the last frame and HUD text whose value
+    changed. Everything else on screen is left as it was. The background
+    and revealed pieces live in a persistent board layer, so restoring any
+    rect is a single blit.
+    """
+
+    def __init__(self, screen, album_atlas):
+        self.screen = screen
+        self.album_atlas = album_atlas
+        self.board_layer = compose_album_layer()
+        self.hud = {}
+        self.pending_rects = []
+        self.moving_rects = []
+        self.fruit_animation = get_animation("fruit")
+        self.fruit_state = None
+        self.needs_full_redraw = True
+        self.rendered_tick = None
+        self.tail_cells = []
+
+    def reveal(self, piece):
+        """Composites a newly revealed album piece into the board layer."""
+        rect = piece_rect(piece)
+        self.album_atlas.blit_tile(self.board_layer, piece, rect)
+        self.pending_rects.append(rect)
+
+    def set_hud_text(self, name, text, pos, render):
+        """Updates a HUD entry, calling render(text) only when the text changed."""
+        current = self.hud.get(name)
+        if current is not None and current[0] == text:
+            return
+        surface = render(text)
+        rect = surface.get_rect(topleft=pos)
+        if current is not None:
+            self.pending_rects.append(current[2])
+        self.pending_rects.append(rect)
+        self.hud[name] = (text, surface, rect)
+
+    def render(self, engine, alpha, now=None):
+        """Repaints the changed parts of the board and pushes only those rects to the display."""
+        fruit_phase = self.fruit_animation.phase(now)
+        pulse = FRUIT_PULSE_SIZES[fruit_phase]
+        body = engine.body
+        cells = body.cells
+        head_rect = lerp_cell_rect(cells[1], cells[0], alpha)
+        tail_rect = lerp_cell_rect(body.vacated, cells[-1], alpha) if body.vacated is not None else None
+
+        # The sliding head and tail always stay within the two cells they move between
+        moving = [cell_rect(cells[1]).union(cell_rect(cells[0]))]
+        if tail_rect is not None:
+            moving.append(cell_rect(body.vacated).union(cell_rect(cells[-1])))
+
+        dirty = self.pending_rects + moving
+        dirty.extend(rect for rect in self.moving_rects if rect not in moving)
+        self.moving_rects = moving
+        self.pending_rects = []
+
+        ticks = engine.tick - self.rendered_tick if self.rendered_tick is not None else None
+        if ticks is None or not 0 <= ticks <= TRACKED_TICKS:
+            self.needs_full_redraw = True
+        elif ticks > 1:
+            # Catch-up ticks: the head entered cells[1:ticks + 1] and the tail left
+            # cells from the end of the body as it was at the previous frame
+            dirty.extend(cell_rect(cell) for cell in itertools.islice(cells, 1, ticks + 1))
+            dirty.extend(cell_rect(cell) for cell in self.tail_cells)
+        self.rendered_tick = engine.tick
+        self.tail_cells = list(itertools.islice(reversed(cells), TRACKED_TICKS + 1))
+
+        fruit_state = (engine.fruit, pulse)
+        if fruit_state != self.fruit_state:
+            if self.fruit_state is not None and self.fruit_state[0] is not None:
+                dirty.append(fruit_rect(*self.fruit_state))
+            if engine.fruit is not None:
+                dirty.append(fruit_rect(engine.fruit, pulse))
+            self.fruit_state = fruit_state
+
+        if self.needs_full_redraw:
+            dirty = [self.screen.get_rect()]
+            self.needs_full_redraw = False
+
+        current_fruit_rect = fruit_rect(engine.fruit, pulse) if engine.fruit is not None else None
+        for rect in dirty:
+            self.screen.set_clip(rect)
+            self._draw_board(rect)
+            self._draw_snake(rect, engine, head_rect, tail_rect)
+            if current_fruit_rect is not None and current_fruit_rect.colliderect(rect):
+                self._draw_fruit(current_fruit_rect, self.fruit_animation.frames[fruit_phase])
+            for text, surface, hud_rect in self.hud.values():
+                if hud_rect.colliderect(rect):
+                    self.screen.blit(surface, hud_rect)
+        self.screen.set_clip(None)
+
+        pygame.display.update(dirty)
+
+    def _draw_board(self, rect):
+        self.screen.blit(self.board_layer, rect, rect)
+
+    def _draw_snake(self, rect, engine, head_rect, tail_rect):
+        body = engine.body
+        head = body.head
+        first_col = max(rect.left // GRID_SIZE, 0)
+        last_col = min((rect.right - 1) // GRID_SIZE, body.cols - 1)
+        first_row = max(rect.top // GRID_SIZE, 0)
+        last_row = min((rect.bottom - 1) // GRID_SIZE, body.rows - 1)
+        for row in range(first_row, last_row + 1):
+            for col in range(first_col, last_col + 1):
+                if body.occupancy[row * body.cols + col] and (col, row) != head:
+                    pygame.draw.rect(self.screen, GREEN, cell_rect((col, row)))
+        if head_rect.colliderect(rect):
+            pygame.draw.rect(self.screen, GREEN, head_rect)
+        if tail_rect is not None and tail_rect.colliderect(rect):
+            pygame.draw.rect(self.screen, GREEN, tail_rect)
+
+    def _draw_fruit(self, target, fruit_surface):
+        # Always use custom fruit image if available, otherwise fall back to white rectangle
+        if fruit_surface is not None:
+            self.screen.blit(fruit_surface, target)
+        else:
+            pygame.draw.rect(self.screen, WHITE, target)
@@ -0,0 +1,276 @@
+import hashlib
+import random
+from collections import OrderedDict
+from io import BytesIO
+import pygame
+from text_cache import get_font
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Procedural album art used when a real cover can't be downloaded or decoded.
+# Every pixel channel is a function of the pixel's position, so the images
+# are computed as whole arrays and handed to pygame.surfarray in one call.
+# Results are memoized by (kind, md5 of the source, size); callers get a copy
+# so drawing on one never changes the cached original.
+
+GENERATED_COVER_CACHE_SIZE = 32
+
+_generated_covers = OrderedDict()
+
+
+def _memoized(key, build):
+    surface = _generated_covers.get(key)
+    if surface is None:
+        surface = build()
+        if surface is None:
+            return None
+        _generated_covers[key] = surface
+        if len(_generated_covers) > GENERATED_COVER_CACHE_SIZE:
+            _generated_covers.popitem(last=False)
+    else:
+        _generated_covers.move_to_end(key)
+    return surface.copy()
+
+def _progress_grids(target_width, target_height):
+    """Returns x/width and y/height as broadcastable (width, 1) and (1, height) arrays."""
+    progress_x = (np.arange(target_width, dtype=np.float64) / target_width)[:, None]
+    progress_y = (np.arange(target_height, dtype=np.float64) / target_height)[None, :]
+    return progress_x, progress_y
+
+def _surface_from_channels(r, g, b, target_width, target_height):
+    """Builds a surface from per-channel arrays indexed [x, y], as surfarray expects."""
+    pixels = np.empty((target_width, target_height, 3), dtype=np.uint8)
+    pixels[..., 0] = r
+    pixels[..., 1] = g
+    pixels[..., 2] = b
+    return pygame.surfarray.make_surface(pixels)
+
+def _two_color_gradient(start_color, end_color, target_width, target_height):
+    """Diagonal gradient without numpy: smoothscale a 2x2 seed up to full size."""
+    mid_color = tuple((s + e) // 2 for s, e in zip(start_color, end_color))
+    seed = pygame.Surface((2, 2))
+    seed.set_at((0, 0), start_color)
+    seed.set_at((1, 0), mid_color)
+    seed.set_at((0, 1), mid_color)
+    seed.set_at((1, 1), end_color)
+    return pygame.transform.smoothscale(seed, (target_width, target_height))
+
+def _hash_color(hash_value, start):
+    return (int(hash_value[start:start+2], 16),
+            int(hash_value[start+2:start+4], 16),
+            int(hash_value[start+4:start+6], 16))
+
+
+def create_fallback_album_cover(target_width, target_height):
+    """Create a fallback album cover when image download fails"""
+    def build():
+        rng = random.Random()
+        if np is not None:
+            noise = np.random.default_rng(rng.getrandbits(32)).random((3, target_width, target_height)) * 0.3
+            progress_x, progress_y = _progress_grids(target_width, target_height)
+            r = np.clip(128 + 127 * (progress_x + noise[0]), 50, 255)
+            g = np.clip(128 + 127 * (progress_y + noise[1]), 50, 255)
+            b = np.clip(128 + 127 * ((progress_x + progress_y) / 2 + noise[2]), 50, 255)
+            surface = _surface_from_channels(r, g, b, target_width, target_height)
+        else:
+            surface = _two_color_gradient((128, 128, 128), (255, 255, 255), target_width, target_height)
+
+        border_color = (rng.randint(100, 255), rng.randint(100, 255), rng.randint(100, 255))
+        pygame.draw.rect(surface, border_color, surface.get_rect(), 2)
+
+        try:
+            font = get_font("Arial", min(target_width, target_height) // 8)
+            text = font.render("ALBUM", True, (255, 255, 255))
+            text_rect = text.get_rect(center=(target_width // 2, target_height // 2))
+            surface.blit(text, text_rect)
+        except Exception as e:
+            pass
+        return surface
+
+    try:
+        return _memoized(("fallback", target_width, target_height), build)
+    except Exception as e:
+        return None
+
+def create_visual_album_cover(image_url, target_width, target_height):
+    """Create a visual album cover that works in browser environments"""
+    def build():
+        r_base, g_base, b_base = _hash_color(hash_value, 0)
+        if r_base == 0 and g_base == 0 and b_base == 0:
+            r_base, g_base, b_base = 128, 64, 192
+
+        if np is not None:
+            progress_x, progress_y = _progress_grids(target_width, target_height)
+            r = (r_base * (0.5 + 0.5 * progress_x)).astype(np.uint8)
+            g = (g_base * (0.5 + 0.5 * progress_y)).astype(np.uint8)
+            b = (b_base * (0.5 + 0.5 * (progress_x + progress_y) / 2)).astype(np.uint8)
+            surface = _surface_from_channels(r, g, b, target_width, target_height)
+        else:
+            surface = _two_color_gradient((r_base // 2, g_base // 2, b_base // 2),
+                                          (r_base, g_base, b_base), target_width, target_height)
+
+        pygame.draw.rect(surface, (255, 255, 255), surface.get_rect(), 1)
+        return surface
+
+    try:
+        hash_value = hashlib.md5(image_url.encode()).hexdigest()
+        return _memoized(("visual", hash_value, target_width, target_height), build)
+    except Exception as e:
+        return create_fallback_album_cover(target_width, target_height)
+
+def create_visual_album_cover_from_data(image_data, target_width, target_height):
+    """Create a visual album cover from image data when pygame.image.load fails"""
+    def build():
+        r_base, g_base, b_base = (max(channel, 50) for channel in _hash_color(hash_value, 0))
+
+        if np is not None:
+            progress_x, progress_y = _progress_grids(target_width, target_height)
+            r = np.maximum((r_base + progress_x * 100 + progress_y * 50).astype(np.int64) % 256, 30)
+            g = np.maximum((g_base + progress_y * 100 + progress_x * 50).astype(np.int64) % 256, 30)
+            b = np.maximum((b_base + (progress_x + progress_y) * 75).astype(np.int64) % 256, 30)
+            surface = _surface_from_channels(r, g, b, target_width, target_height)
+        else:
+            surface = _two_color_gradient((r_base, g_base, b_base),
+                                          ((r_base + 150) % 256, (g_base + 150) % 256, (b_base + 150) % 256),
+                                          target_width, target_height)
+
+        pygame.draw.rect(surface, _hash_color(hash_value, 6), surface.get_rect(), 2)
+        return surface
+
+    try:
+        hash_value = hashlib.md5(image_data).hexdigest()
+        return _memoized(("data", hash_value, target_width, target_height), build)
+    except Exception as e:
+        return create_fallback_album_cover(target_width, target_height)
+
+def create_album_cover_like_surface(image_data, target_width, target_height):
+    """Create a surface that looks more like an actual album cover"""
+    def build():
+        colors = [_hash_color(hash_value, i) for i in range(0, len(hash_value) - 5, 6)]
+        if len(colors) < 2:
+            colors.extend([(128, 128, 128), (64, 64, 64)])
+        color1, color2 = colors[0], colors[1]
+
+        if np is not None:
+            progress_x, progress_y = _progress_grids(target_width, target_height)
+            gradient_progress = (progress_x + progress_y) / 2
+
+            # The texture repeats the hash digits along (x * 7 + y * 11)
+            digits = np.array([int(char, 16) for char in hash_value], dtype=np.int64)
+            xs = np.arange(target_width)[:, None]
+            ys = np.arange(target_height)[None, :]
+            texture_offset = (digits[(xs * 7 + ys * 11) % len(hash_value)] - 8) * 3
+
+            if len(colors) > 2:
+                center_x, center_y = target_width // 2, target_height // 2
+                in_center = (xs - center_x) ** 2 + (ys - center_y) ** 2 < (target_width // 4) ** 2
+                blend_factor = 0.3
+
+            channels = []
+            for channel in range(3):
+                value = (color1[channel] * (1 - gradient_progress) + color2[channel] * gradient_progress).astype(np.int64)
+                value = np.clip(value + texture_offset, 0, 255)
+                if len(colors) > 2:
+                    blended = (value * (1 - blend_factor) + colors[2][channel] * blend_factor).astype(np.int64)
+                    value = np.where(in_center, blended, value)
+                channels.append(value)
+            surface = _surface_from_channels(*channels, target_width, target_height)
+        else:
+            surface = _two_color_gradient(color1, color2, target_width, target_height)
+
+        pygame.draw.rect(surface, (255, 255, 255), surface.get_rect(), 2)
+        pygame.draw.rect(surface, (200, 200, 200), surface.get_rect(), 1)
+
+        shadow_surface = pygame.Surface((target_width + 4, target_height + 4), pygame.SRCALPHA)
+        pygame.draw.rect(shadow_surface, (0, 0, 0, 80), (4, 4, target_width, target_height))
+        surface.blit(shadow_surface, (-2, -2))
+        return surface
+
+    try:
+        hash_value = hashlib.md5(image_data).hexdigest()
+        return _memoized(("album_like", hash_value, target_width, target_height), build)
+    except Exception as e:
+        return create_visual_album_cover_from_data(image_data, target_width, target_height)
+
+
+PALETTE_SIZE = 5
+PALETTE_SAMPLE_SIZE = 32
+PALETTE_ITERATIONS = 8
+
+def extract_palette(surface, count=PALETTE_SIZE):
+    """Returns the cover's dominant colors, most common first.
+
+    Runs k-means over a PALETTE_SAMPLE_SIZE square downsample, with the
+    centroids seeded at luminance quantiles so the result is deterministic.
+    Without numpy, the four corners of a 2x2 smoothscale are used instead.
+    """
+    if np is None:
+        small = pygame.transform.smoothscale(surface, (2, 2))
+        return [tuple(small.get_at((x, y)))[:3] for y in range(2) for x in range(2)]
+
+    small = pygame.transform.smoothscale(surface, (PALETTE_SAMPLE_SIZE, PALETTE_SAMPLE_SIZE))
+    pixels = pygame.surfarray.array3d(small).reshape(-1, 3).astype(np.float64)
+    luminance = pixels @ np.array([0.299, 0.587, 0.114])
+    by_luminance = np.argsort(luminance)
+    centroids = pixels[by_luminance[np.linspace(0, len(pixels) - 1, count).astype(int)]]
+
+    for _ in range(PALETTE_ITERATIONS):
+        distances = ((pixels[:, None, :] - centroids[None, :, :]) ** 2).sum(axis=2)
+        labels = distances.argmin(axis=1)
+        counts = np.bincount(labels, minlength=count)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, pixels)
+        filled = counts > 0
+        centroids[filled] = sums[filled] / counts[filled, None]
+
+    return [tuple(int(channel) for channel in centroids[i]) for i in np.argsort(-counts) if counts[i] > 0]
+
+def create_palette_album_cover(palette, target_width, target_height):
+    """Create a fallback album cover as a diagonal gradient through the album's dominant colors"""
+    stops = list(palette[:3]) or [(128, 128, 128)]
+    if len(stops) == 1:
+        stops.append(stops[0])
+
+    def build():
+        if np is not None:
+            progress_x, progress_y = _progress_grids(target_width, target_height)
+            gradient_progress = (progress_x + progress_y) / 2
+            positions = np.linspace(0, 1, len(stops))
+            channels = [np.interp(gradient_progress, positions, [color[channel] for color in stops])
+                        for channel in range(3)]
+            surface = _surface_from_channels(*channels, target_width, target_height)
+        else:
+            surface = _two_color_gradient(stops[0], stops[-1], target_width, target_height)
+
+        pygame.draw.rect(surface, stops[-1], surface.get_rect(), 2)
+        return surface
+
+    try:
+        return _memoized(("palette", tuple(stops), target_width, target_height), build)
+    except Exception as e:
+        return create_fallback_album_cover(target_width, target_height)
+
+def decode_cover(image_data, size):
+    """Decodes encoded image bytes (JPEG/PNG) into a display-format surface of the given size.
+
+    Returns None if the bytes can't be decoded, so callers can fall back to
+    one of the generated covers.
+    """
+    try:
+        image = pygame.image.load(BytesIO(image_data))
+    except Exception as e:
+        return None
+    try:
+        image = image.convert()
+    except pygame.error:
+        pass  # No display mode yet; keep the decoded format
+    size = tuple(size)
+    if image.get_size() != size:
+        try:
+            image = pygame.transform.smoothscale(image, size)
+        except ValueError:
+            image = pygame.transform.scale(image, size)
+    return image
@@ -0,0 +1,185 @@
+import asyncio
+import base64
+import hashlib
+import os
+import sys
+from collections import OrderedDict
+from backend_client import await_js_promise
+
+# Album covers are cached in two tiers, both keyed by (image URL, size).
+# Decoded surfaces live in an in-memory LRU bounded by their pixel bytes;
+# the encoded bytes the backend sent are kept in a persistent store, so a
+# cover downloaded once is never fetched again. The store is IndexedDB in
+# the browser and a directory of files on desktop. Each album's dominant
+# colors are kept alongside, keyed by album URI, so fallback art and themed
+# screens never need the full cover.
+
+COVER_MEMORY_BUDGET = 48 * 1024 * 1024
+PALETTE_CACHE_SIZE = 256
+COVER_CACHE_DIR = os.environ.get("SPOTISNAKE_COVER_CACHE_DIR",
+                                 os.path.join(os.path.expanduser("~"), ".spotisnake", "covers"))
+INDEXEDDB_TIMEOUT = 1.0
+
+
+def cover_key(url, size):
+    """Returns the storage key for an image URL at a given size."""
+    return hashlib.md5(f"{url}|{size[0]}x{size[1]}".encode()).hexdigest()
+
+def surface_bytes(surface):
+    return surface.get_bytesize() * surface.get_width() * surface.get_height()
+
+
+class DirectoryCoverStore:
+    """Persistent cover tier for desktop: one file of encoded image bytes per URL and size."""
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def _path(self, url, size):
+        return os.path.join(self.directory, cover_key(url, size))
+
+    async def load(self, url, size):
+        try:
+            with open(self._path(url, size), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    async def save(self, url, size, image_data):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            path = self._path(url, size)
+            temp_path = path + ".tmp"
+            with open(temp_path, "wb") as f:
+                f.write(image_data)
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"DEBUG: cover_cache.py - Could not store cover on disk: {e}")
+
+
+INDEXEDDB_STORE_JS = '''
+if (!window.spotisnake_cover_store) {
+    window.spotisnake_cover_store = (() => {
+        let dbPromise = null;
+        function openDb() {
+            if (!dbPromise) {
+                dbPromise = new Promise((resolve, reject) => {
+                    const request = indexedDB.open("spotisnake", 1);
+                    request.onupgradeneeded = () => request.result.createObjectStore("covers");
+                    request.onsuccess = () => resolve(request.result);
+                    request.onerror = () => reject(request.error);
+                });
+            }
+            return dbPromise;
+        }
+        function load(key) {
+            return openDb().then(db => new Promise(resolve => {
+                const request = db.transaction("covers").objectStore("covers").get(key);
+                request.onsuccess = () => resolve(request.result || "");
+                request.onerror = () => resolve("");
+            })).catch(() => "");
+        }
+        function save(key, data) {
+            openDb().then(db => {
+                db.transaction("covers", "readwrite").objectStore("covers").put(data, key);
+            }).catch(() => {});
+        }
+        return { load: load, save: save };
+    })();
+}
+'''
+
+class IndexedDBCoverStore:
+    """Persistent cover tier for the browser: base64 image data in IndexedDB."""
+
+    def __init__(self):
+        self.installed = False
+
+    def _install(self):
+        import js
+        if not self.installed:
+            js.eval(INDEXEDDB_STORE_JS)
+            self.installed = True
+        return js
+
+    async def load(self, url, size):
+        try:
+            js = self._install()
+            # Each load awaits its own promise, so concurrent loads of one key don't race
+            promise = js.window.spotisnake_cover_store.load(cover_key(url, size))
+            result = await asyncio.wait_for(await_js_promise(promise), INDEXEDDB_TIMEOUT)
+            return base64.b64decode(str(result)) if result else None
+        except Exception as e:
+            print(f"DEBUG: cover_cache.py - IndexedDB load failed: {e}")
+            return None
+
+    async def save(self, url, size, image_data):
+        try:
+            js = self._install()
+            js.window.spotisnake_cover_store.save(cover_key(url, size), base64.b64encode(image_data).decode("ascii"))
+        except Exception as e:
+            print(f"DEBUG: cover_cache.py - IndexedDB save failed: {e}")
+
+
+class CoverCache:
+    """In-memory LRU of decoded cover surfaces in front of a persistent byte store."""
+
+    def __init__(self, store, max_bytes=COVER_MEMORY_BUDGET):
+        self.store = store
+        self.max_bytes = max_bytes
+        self.surfaces = OrderedDict()
+        self.total_bytes = 0
+        self.palettes = OrderedDict()
+
+    def get(self, url, size):
+        """Returns the decoded surface for (url, size) if it is in memory."""
+        key = (url, tuple(size))
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+        return surface
+
+    def put(self, url, size, surface):
+        """Keeps a decoded surface in memory, evicting the least recently used ones over budget."""
+        key = (url, tuple(size))
+        previous = self.surfaces.pop(key, None)
+        if previous is not None:
+            self.total_bytes -= surface_bytes(previous)
+        self.surfaces[key] = surface
+        self.total_bytes += surface_bytes(surface)
+        while self.total_bytes > self.max_bytes and len(self.surfaces) > 1:
+            _, evicted = self.surfaces.popitem(last=False)
+            self.total_bytes -= surface_bytes(evicted)
+
+    def get_palette(self, album_key):
+        """Returns the dominant colors recorded for an album, or None."""
+        palette = self.palettes.get(album_key)
+        if palette is not None:
+            self.palettes.move_to_end(album_key)
+        return palette
+
+    def put_palette(self, album_key, palette):
+        self.palettes[album_key] = palette
+        self.palettes.move_to_end(album_key)
+        if len(self.palettes) > PALETTE_CACHE_SIZE:
+            self.palettes.popitem(last=False)
+
+    async def load_bytes(self, url, size):
+        """Returns the encoded image bytes for (url, size) from the persistent tier, or None."""
+        return await self.store.load(url, tuple(size))
+
+    async def save_bytes(self, url, size, image_data):
+        """Writes downloaded image bytes to the persistent tier."""
+        await self.store.save(url, tuple(size), image_data)
+
+    def clear_memory(self):
+        self.surfaces.clear()
+        self.total_bytes = 0
+
+
+def create_cover_store():
+    if sys.platform == "emscripten":
+        return IndexedDBCoverStore()
+    return DirectoryCoverStore(COVER_CACHE_DIR)
+
+cover_cache = CoverCache(create_cover_store())
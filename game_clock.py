@@ -0,0 +1,53 @@
+import time
+
+# Fixed-timestep pacing for the game loop: the simulation ticks on exact
+# boundaries of 1/rate seconds measured with time.monotonic, while frames are
+# drawn at the display rate and interpolate between the last two ticks.
+
+
+class FixedStepScheduler:
+    """Accumulates real time and releases simulation ticks at a fixed rate."""
+
+    def __init__(self, tick_rate, render_fps=60, max_catch_up_ticks=5, clock=time.monotonic):
+        self.clock = clock
+        self.tick_interval = 1.0 / tick_rate
+        self.render_interval = 1.0 / render_fps
+        self.max_catch_up_ticks = max_catch_up_ticks
+        self.accumulator = 0.0
+        self.last_time = clock()
+        self.next_frame_time = self.last_time
+
+    def set_rate(self, tick_rate):
+        """Changes the tick rate without losing time already accumulated."""
+        self.tick_interval = 1.0 / tick_rate
+
+    def update(self):
+        """Adds the real time elapsed since the previous update to the accumulator."""
+        now = self.clock()
+        self.accumulator += now - self.last_time
+        self.last_time = now
+        # After a stall (tab in background, slow network callback) drop the
+        # backlog instead of fast-forwarding the snake into a wall
+        max_backlog = self.max_catch_up_ticks * self.tick_interval
+        if self.accumulator > max_backlog:
+            self.accumulator = max_backlog
+
+    def consume_tick(self):
+        """Returns True and uses up one tick if a full tick interval has accumulated."""
+        if self.accumulator >= self.tick_interval:
+            self.accumulator -= self.tick_interval
+            return True
+        return False
+
+    @property
+    def alpha(self):
+        """Fraction of the way from the last tick to the next one, for interpolation."""
+        return min(self.accumulator / self.tick_interval, 1.0)
+
+    def frame_delay(self):
+        """Returns how long to sleep so frames land on the render rate's boundaries."""
+        now = self.clock()
+        self.next_frame_time += self.render_interval
+        if self.next_frame_time < now:
+            self.next_frame_time = now
+        return self.next_frame_time - now
@@ -0,0 +1,267 @@
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+# Backend cache for cover images. Blobs are stored on disk under their
+# SHA-256, so identical images fetched through different URLs are kept once;
+# small ref files map each cache key (a source URL, or a URL plus a resize)
+# to the blob it resolved to. Disk use is capped by an LRU index over the
+# blobs; evicting a blob also deletes the refs that point at it. The most
+# recently served bytes stay in an in-memory hot set, and concurrent misses
+# for the same key wait for a single upstream fetch.
+
+IMAGE_CACHE_DIR = os.environ.get("SPOTISNAKE_IMAGE_CACHE_DIR",
+                                 os.path.join(os.path.abspath("."), "image_cache"))
+IMAGE_CACHE_MAX_BYTES = int(os.environ.get("SPOTISNAKE_IMAGE_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+IMAGE_CACHE_HOT_BYTES = 32 * 1024 * 1024
+
+
+def _key_name(key):
+    return hashlib.sha1(key.encode()).hexdigest()
+
+
+class _Flight:
+    """An upstream fetch in progress that other requests for the same key wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.data = None
+        self.error = None
+
+
+class ImageCache:
+    """Content-addressed disk cache with an LRU size cap, a hot set and single-flight fetching."""
+
+    def __init__(self, directory=IMAGE_CACHE_DIR, max_bytes=IMAGE_CACHE_MAX_BYTES, hot_bytes=IMAGE_CACHE_HOT_BYTES):
+        self.blob_dir = os.path.join(directory, "blobs")
+        self.ref_dir = os.path.join(directory, "refs")
+        self.max_bytes = max_bytes
+        self.hot_bytes = hot_bytes
+        self.lock = threading.Lock()
+        self.blobs = OrderedDict()
+        self.disk_bytes = 0
+        self.refs = {}
+        self.ref_targets = {}
+        self.hot = OrderedDict()
+        self.hot_total = 0
+        self.flights = {}
+        os.makedirs(self.blob_dir, exist_ok=True)
+        os.makedirs(self.ref_dir, exist_ok=True)
+        self._load_index()
+
+    def _load_index(self):
+        """Rebuilds the LRU index from the blobs on disk, oldest access first."""
+        entries = []
+        for name in os.listdir(self.blob_dir):
+            path = os.path.join(self.blob_dir, name)
+            try:
+                if name.endswith(".tmp"):
+                    # Left behind by an interrupted _write_atomic
+                    os.remove(path)
+                    continue
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, name, stat.st_size))
+        for _, digest, size in sorted(entries):
+            self.blobs[digest] = size
+            self.disk_bytes += size
+
+        # Index the refs by blob, dropping any left pointing at a missing blob
+        for name in os.listdir(self.ref_dir):
+            path = os.path.join(self.ref_dir, name)
+            try:
+                if name.endswith(".tmp"):
+                    os.remove(path)
+                    continue
+                with open(path) as f:
+                    digest = f.read().strip()
+                if digest in self.blobs:
+                    self._link(name, digest)
+                else:
+                    os.remove(path)
+            except OSError:
+                continue
+
+    def get_or_fetch(self, key, fetch):
+        """Returns the cached bytes for key, calling fetch() for them at most once per miss."""
+        data = self._lookup(key)
+        if data is not None:
+            return data
+
+        name = _key_name(key)
+        with self.lock:
+            # Look again under the lock: a leader may have stored the bytes and
+            # ended its flight since the lookup above
+            data, blob_path = self._hot_get(name)
+            stored = data is None and name in self.ref_targets
+            if data is None and not stored:
+                flight = self.flights.get(key)
+                leader = flight is None
+                if leader:
+                    flight = _Flight()
+                    self.flights[key] = flight
+        if data is not None:
+            self._touch_file(blob_path)
+            return data
+        if stored:
+            # On disk now; if the blob has vanished _lookup drops the ref and we try again
+            data = self._lookup(key)
+            return data if data is not None else self.get_or_fetch(key, fetch)
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.data
+
+        try:
+            flight.data = fetch()
+            self._store(key, flight.data)
+            return flight.data
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self.lock:
+                del self.flights[key]
+            flight.done.set()
+
+    def _lookup(self, key):
+        name = _key_name(key)
+        with self.lock:
+            data, blob_path = self._hot_get(name)
+        if data is not None:
+            self._touch_file(blob_path)
+            return data
+        try:
+            with open(os.path.join(self.ref_dir, name)) as f:
+                digest = f.read().strip()
+        except OSError:
+            with self.lock:
+                self._unlink(name)
+            return None
+        blob_path = os.path.join(self.blob_dir, digest)
+        try:
+            with open(blob_path, "rb") as f:
+                data = f.read()
+            os.utime(blob_path)
+        except OSError:
+            # The blob is gone (evicted by another process, or deleted); so is the ref
+            with self.lock:
+                self._unlink(name)
+                size = self.blobs.pop(digest, None)
+                if size is not None:
+                    self.disk_bytes -= size
+            self._remove_file(os.path.join(self.ref_dir, name))
+            return None
+        with self.lock:
+            if digest in self.blobs:
+                self.blobs.move_to_end(digest)
+            self._remember(name, data)
+        return data
+
+    def _store(self, key, data):
+        name = _key_name(key)
+        digest = hashlib.sha256(data).hexdigest()
+        try:
+            blob_path = os.path.join(self.blob_dir, digest)
+            if not os.path.exists(blob_path):
+                self._write_atomic(blob_path, data)
+            self._write_atomic(os.path.join(self.ref_dir, name), digest.encode())
+        except OSError as e:
+            logging.warning(f"Image cache write failed for {key}: {e}")
+        with self.lock:
+            if digest not in self.blobs:
+                self.blobs[digest] = len(data)
+                self.disk_bytes += len(data)
+            self.blobs.move_to_end(digest)
+            self._link(name, digest)
+            self._remember(name, data)
+            evicted, evicted_refs = self._evict()
+        for digest in evicted:
+            self._remove_file(os.path.join(self.blob_dir, digest))
+        for ref_name in evicted_refs:
+            self._remove_file(os.path.join(self.ref_dir, ref_name))
+
+    def _hot_get(self, name):
+        """Returns (bytes, blob path) for a hot-set hit, or (None, None). Call with lock held.
+
+        A hit also counts as a use of the blob on disk, so covers served from
+        memory are the last to be evicted.
+        """
+        data = self.hot.get(name)
+        if data is None:
+            return None, None
+        self.hot.move_to_end(name)
+        digest = self.ref_targets.get(name)
+        if digest is None or digest not in self.blobs:
+            return data, None
+        self.blobs.move_to_end(digest)
+        return data, os.path.join(self.blob_dir, digest)
+
+    def _touch_file(self, path):
+        """Bumps a blob's mtime so the LRU order survives a restart."""
+        if path is None:
+            return
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def _remove_file(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _link(self, name, digest):
+        """Records that ref name points at a blob. Call with lock held (or during init)."""
+        self._unlink(name)
+        self.ref_targets[name] = digest
+        self.refs.setdefault(digest, set()).add(name)
+
+    def _unlink(self, name):
+        digest = self.ref_targets.pop(name, None)
+        if digest is not None:
+            names = self.refs.get(digest)
+            if names is not None:
+                names.discard(name)
+                if not names:
+                    del self.refs[digest]
+
+    def _write_atomic(self, path, data):
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+    def _remember(self, name, data):
+        """Adds bytes to the hot set, dropping the least recently served over budget. Call with lock held."""
+        previous = self.hot.pop(name, None)
+        if previous is not None:
+            self.hot_total -= len(previous)
+        self.hot[name] = data
+        self.hot_total += len(data)
+        while self.hot_total > self.hot_bytes and len(self.hot) > 1:
+            _, dropped = self.hot.popitem(last=False)
+            self.hot_total -= len(dropped)
+
+    def _evict(self):
+        """Drops least recently used blobs, and the refs to them, until under the cap. Call with lock held.
+
+        Returns the evicted blob digests and ref names so their files can be
+        deleted outside the lock.
+        """
+        evicted = []
+        evicted_refs = []
+        while self.disk_bytes > self.max_bytes and len(self.blobs) > 1:
+            digest, size = self.blobs.popitem(last=False)
+            self.disk_bytes -= size
+            evicted.append(digest)
+            for name in self.refs.pop(digest, ()):
+                del self.ref_targets[name]
+                evicted_refs.append(name)
+        return evicted, evicted_refs
@@ -1,4 +1,5 @@
 from ui import start_menu
+from scene_manager import Scene, run_scenes
 import asyncio
 import pygame
 
@@ -14,7 +15,7 @@ async def main():
         except Exception:
             pass
         
-        await start_menu()
+        await run_scenes(Scene(start_menu))
     except SystemExit:
         pass
     except KeyboardInterrupt:
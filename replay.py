@@ -0,0 +1,258 @@
+import asyncio
+import base64
+import os
+import struct
+import sys
+import time
+from backend_client import await_js_promise
+from snake_engine import SnakeEngine, UP, DOWN, LEFT, RIGHT
+
+# Compact game replays: the engine seed and configuration, followed by one
+# varint per turn packing (ticks since the previous turn << 2 | direction).
+# Most turns fit in one or two bytes, and since SnakeEngine is deterministic
+# re-simulating the inputs reproduces the game exactly.
+#
+# Finished games, including ones closed mid-round, are saved to a persistent
+# store like the cover cache's: IndexedDB in the browser and a directory of
+# .ssr files on desktop. Only the newest REPLAY_STORE_LIMIT are kept.
+
+REPLAY_MAGIC = b"SSR1"
+HEADER_FORMAT = "<4sHHHHIddd"
+DIRECTION_CODES = {UP: 0, DOWN: 1, LEFT: 2, RIGHT: 3}
+CODE_DIRECTIONS = {code: direction for direction, code in DIRECTION_CODES.items()}
+REPLAY_STORE_LIMIT = 20
+REPLAY_DIR = os.environ.get("SPOTISNAKE_REPLAY_DIR",
+                            os.path.join(os.path.expanduser("~"), ".spotisnake", "replays"))
+INDEXEDDB_TIMEOUT = 1.0
+
+
+def _write_varint(out, value):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def _read_varint(data, offset):
+    value = 0
+    shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+class ReplayRecorder:
+    """Records the turns applied to a SnakeEngine so the game can be replayed."""
+
+    def __init__(self, engine):
+        self.config = (engine.width, engine.height, engine.grid_size, engine.album_grid_size,
+                       engine.seed, engine.start_speed, engine.speed_increment, engine.max_speed)
+        self.last_direction = engine.direction
+        self.turns = []
+
+    def record(self, engine):
+        """Call after every engine.step(); stores the tick if the direction changed."""
+        if engine.direction != self.last_direction:
+            self.turns.append((engine.tick, engine.direction))
+            self.last_direction = engine.direction
+
+    def finish(self, engine):
+        """Encodes the recording, ending at the engine's current tick and score."""
+        out = bytearray(struct.pack(HEADER_FORMAT, REPLAY_MAGIC, *self.config))
+        _write_varint(out, len(self.turns))
+        previous_tick = 0
+        for tick, direction in self.turns:
+            _write_varint(out, (tick - previous_tick) << 2 | DIRECTION_CODES[direction])
+            previous_tick = tick
+        _write_varint(out, engine.tick)
+        _write_varint(out, engine.score)
+        return bytes(out)
+
+
+def decode_replay(data):
+    """Returns (config, turns, final_tick, final_score) from encoded replay bytes."""
+    header_size = struct.calcsize(HEADER_FORMAT)
+    fields = struct.unpack_from(HEADER_FORMAT, data)
+    if fields[0] != REPLAY_MAGIC:
+        raise ValueError("Not a SpotiSnake replay")
+    config = fields[1:]
+    offset = header_size
+    turn_count, offset = _read_varint(data, offset)
+    turns = []
+    tick = 0
+    for _ in range(turn_count):
+        packed, offset = _read_varint(data, offset)
+        tick += packed >> 2
+        turns.append((tick, CODE_DIRECTIONS[packed & 3]))
+    final_tick, offset = _read_varint(data, offset)
+    final_score, offset = _read_varint(data, offset)
+    return config, turns, final_tick, final_score
+
+def play_replay(data):
+    """Re-simulates a replay as fast as possible and returns the finished engine."""
+    config, turns, final_tick, final_score = decode_replay(data)
+    game_width, game_height, grid_size, album_grid_size, seed, start_speed, speed_increment, max_speed = config
+    engine = SnakeEngine(game_width, game_height, grid_size, album_grid_size,
+                         start_speed, speed_increment, max_speed, seed=seed)
+    turn_index = 0
+    while engine.tick < final_tick and engine.alive:
+        direction = None
+        if turn_index < len(turns) and turns[turn_index][0] == engine.tick + 1:
+            direction = turns[turn_index][1]
+            turn_index += 1
+        engine.step(direction)
+    return engine
+
+def game_config():
+    """The board and speed settings a replay of this game must have been recorded with (everything but the seed)."""
+    from shared_constants import width, height, GRID_SIZE, ALBUM_GRID_SIZE, SNAKE_SPEED, SPEED_INCREMENT, MAX_SPEED
+    return (width, height, GRID_SIZE, ALBUM_GRID_SIZE, SNAKE_SPEED, SPEED_INCREMENT, MAX_SPEED)
+
+def verify_replay(data):
+    """Returns True if the replay was played with the game's settings and re-simulating it reaches the score it claims."""
+    try:
+        config, turns, final_tick, final_score = decode_replay(data)
+        # A replay on a smaller board or at a slower speed could claim an easy score
+        if config[:4] + config[5:] != game_config():
+            return False
+        engine = play_replay(data)
+    except (ValueError, IndexError, KeyError, struct.error):
+        return False
+    return engine.tick == final_tick and engine.score == final_score
+
+
+def replay_key():
+    """A storage key for a new replay; keys sort oldest first."""
+    return f"{time.time_ns():020d}"
+
+
+class DirectoryReplayStore:
+    """Replay store for desktop: one .ssr file per game."""
+
+    def __init__(self, directory, limit=REPLAY_STORE_LIMIT):
+        self.directory = directory
+        self.limit = limit
+
+    def _keys(self):
+        try:
+            return sorted(name[:-4] for name in os.listdir(self.directory) if name.endswith(".ssr"))
+        except OSError:
+            return []
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".ssr")
+
+    async def save(self, key, data):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            path = self._path(key)
+            temp_path = path + ".tmp"
+            with open(temp_path, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, path)
+            for old_key in self._keys()[:-self.limit]:
+                os.remove(self._path(old_key))
+        except OSError as e:
+            print(f"DEBUG: replay.py - Could not store replay on disk: {e}")
+
+    async def load_all(self):
+        replays = []
+        for key in self._keys():
+            try:
+                with open(self._path(key), "rb") as f:
+                    replays.append(f.read())
+            except OSError:
+                pass
+        return replays
+
+
+INDEXEDDB_REPLAY_STORE_JS = '''
+if (!window.spotisnake_replay_store) {
+    window.spotisnake_replay_store = (() => {
+        let dbPromise = null;
+        function openDb() {
+            if (!dbPromise) {
+                dbPromise = new Promise((resolve, reject) => {
+                    const request = indexedDB.open("spotisnake_replays", 1);
+                    request.onupgradeneeded = () => request.result.createObjectStore("replays");
+                    request.onsuccess = () => resolve(request.result);
+                    request.onerror = () => reject(request.error);
+                });
+            }
+            return dbPromise;
+        }
+        function save(key, data, limit) {
+            return openDb().then(db => new Promise(resolve => {
+                const store = db.transaction("replays", "readwrite").objectStore("replays");
+                store.put(data, key);
+                const keys = store.getAllKeys();
+                keys.onsuccess = () => {
+                    keys.result.slice(0, Math.max(0, keys.result.length - limit)).forEach(old => store.delete(old));
+                    resolve(true);
+                };
+                keys.onerror = () => resolve(false);
+            })).catch(() => false);
+        }
+        function loadAll() {
+            return openDb().then(db => new Promise(resolve => {
+                const request = db.transaction("replays").objectStore("replays").getAll();
+                request.onsuccess = () => resolve(JSON.stringify(request.result || []));
+                request.onerror = () => resolve("[]");
+            })).catch(() => "[]");
+        }
+        return { save: save, loadAll: loadAll };
+    })();
+}
+'''
+
+class IndexedDBReplayStore:
+    """Replay store for the browser: base64 replay bytes in IndexedDB."""
+
+    def __init__(self, limit=REPLAY_STORE_LIMIT):
+        self.limit = limit
+        self.installed = False
+
+    def _install(self):
+        import js
+        if not self.installed:
+            js.eval(INDEXEDDB_REPLAY_STORE_JS)
+            self.installed = True
+        return js
+
+    async def save(self, key, data):
+        try:
+            js = self._install()
+            promise = js.window.spotisnake_replay_store.save(key, base64.b64encode(data).decode("ascii"), self.limit)
+            await asyncio.wait_for(await_js_promise(promise), INDEXEDDB_TIMEOUT)
+        except Exception as e:
+            print(f"DEBUG: replay.py - IndexedDB save failed: {e}")
+
+    async def load_all(self):
+        try:
+            import json
+            js = self._install()
+            promise = js.window.spotisnake_replay_store.loadAll()
+            result = await asyncio.wait_for(await_js_promise(promise), INDEXEDDB_TIMEOUT)
+            return [base64.b64decode(item) for item in json.loads(str(result))]
+        except Exception as e:
+            print(f"DEBUG: replay.py - IndexedDB load failed: {e}")
+            return []
+
+
+def create_replay_store():
+    if sys.platform == "emscripten":
+        return IndexedDBReplayStore()
+    return DirectoryReplayStore(REPLAY_DIR)
+
+replay_store = create_replay_store()
+
+async def save_replay(data):
+    """Persists a finished game's replay, keeping only the newest REPLAY_STORE_LIMIT."""
+    await replay_store.save(replay_key(), data)
+
+async def load_replays():
+    """Returns the saved replays, oldest first."""
+    return await replay_store.load_all()
@@ -0,0 +1,24 @@
+# Screens hand control to each other by returning the next Scene instead of
+# awaiting it, so one loop drives the whole session and a finished screen's
+# locals (album surfaces, piece dicts, engines) are released straight away.
+
+
+class Scene:
+    """A screen coroutine function and the arguments to run it with."""
+
+    def __init__(self, handler, *args):
+        self.handler = handler
+        self.args = args
+
+    async def run(self):
+        return await self.handler(*self.args)
+
+    def __repr__(self):
+        return f"Scene({self.handler.__name__})"
+
+
+async def run_scenes(first_scene):
+    """Runs scenes one after another until a screen returns None."""
+    scene = first_scene
+    while scene is not None:
+        scene = await scene.run()
@@ -46,6 +46,7 @@ SPOTIFY_AUTH_SCOPE = "user-modify-playback-state user-read-playback-state user-r
 # Game dimensions
 width = 600
 height = 600
+SEARCH_COVER_SIZE = 60
 
 # Colors
 WHITE = (255, 255, 255)
@@ -59,6 +60,7 @@ DARK_GREY = (30,30,30)
 
 # Game settings
 SNAKE_SPEED = 10
+RENDER_FPS = 60
 GRID_SIZE = 30
 ALBUM_GRID_SIZE = 60
 
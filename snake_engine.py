@@ -0,0 +1,261 @@
+import random
+from collections import deque
+
+# Headless SpotiSnake simulation. Nothing in here may import pygame, js or
+# the network layer so the same rules can run in the game, in replays and in
+# benchmarks at full CPU speed.
+
+UP = 'UP'
+DOWN = 'DOWN'
+LEFT = 'LEFT'
+RIGHT = 'RIGHT'
+
+DIRECTION_VECTORS = {
+    UP: (0, -1),
+    DOWN: (0, 1),
+    LEFT: (-1, 0),
+    RIGHT: (1, 0),
+}
+
+OPPOSITE_DIRECTIONS = {
+    UP: DOWN,
+    DOWN: UP,
+    LEFT: RIGHT,
+    RIGHT: LEFT,
+}
+
+# Events returned by SnakeEngine.step(), as (EVENT, payload) tuples
+FRUIT_EATEN = "FRUIT_EATEN"
+PIECE_REVEALED = "PIECE_REVEALED"
+SPEED_UP = "SPEED_UP"
+GAME_WON = "GAME_WON"
+GAME_OVER = "GAME_OVER"
+
+START_LENGTH = 5
+FRUIT_POINTS = 10
+SPEED_UP_EVERY = 50
+
+
+class SnakeBody:
+    """Snake segments in a deque plus a per-cell occupancy grid, so moves and hit tests are O(1)."""
+
+    def __init__(self, cols, rows, cells):
+        self.cols = cols
+        self.rows = rows
+        self.occupancy = bytearray(cols * rows)
+        self.cells = deque()
+        self.vacated = None
+        for cell in cells:
+            self.cells.append(cell)
+            self.occupancy[self.index(cell)] = 1
+
+    def index(self, cell):
+        return cell[1] * self.cols + cell[0]
+
+    def in_bounds(self, cell):
+        return 0 <= cell[0] < self.cols and 0 <= cell[1] < self.rows
+
+    @property
+    def head(self):
+        return self.cells[0]
+
+    @property
+    def tail(self):
+        return self.cells[-1]
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __iter__(self):
+        return iter(self.cells)
+
+    def __contains__(self, cell):
+        return self.in_bounds(cell) and self.occupancy[self.index(cell)] != 0
+
+    def advance(self, head, grow=False):
+        """Moves the head onto an in-bounds cell, dropping the tail unless growing.
+
+        Returns True when the new head lands on another segment of the body.
+        """
+        if grow:
+            self.vacated = None
+        else:
+            self.vacated = self.cells.pop()
+            self.occupancy[self.index(self.vacated)] = 0
+        head_index = self.index(head)
+        hit_self = self.occupancy[head_index] != 0
+        self.cells.appendleft(head)
+        self.occupancy[head_index] = 1
+        return hit_self
+
+
+class FreeCellIndex:
+    """Free board cells grouped by album piece, split into hidden and revealed pools.
+
+    Each pool is an array of cell indices plus a position table, so cells move
+    between pools with swap-removes and a fruit spawn is a single random pick.
+    """
+
+    HIDDEN = 0
+    REVEALED = 1
+    OCCUPIED = 2
+
+    def __init__(self, cols, rows, cells_per_piece):
+        self.cols = cols
+        piece_cols = -(-cols // cells_per_piece)
+        piece_rows = -(-rows // cells_per_piece)
+        cell_count = cols * rows
+        self.piece_of = [(i // cols) // cells_per_piece * piece_cols + (i % cols) // cells_per_piece
+                         for i in range(cell_count)]
+        self.piece_cells = [[] for _ in range(piece_cols * piece_rows)]
+        for i in range(cell_count):
+            self.piece_cells[self.piece_of[i]].append(i)
+        self.revealed = bytearray(piece_cols * piece_rows)
+        self.pool_of = bytearray(cell_count)
+        self.position = list(range(cell_count))
+        self.pools = (list(range(cell_count)), [])
+
+    def _remove(self, index):
+        pool = self.pools[self.pool_of[index]]
+        slot = self.position[index]
+        last = pool.pop()
+        if last != index:
+            pool[slot] = last
+            self.position[last] = slot
+
+    def _add(self, index, pool_id):
+        pool = self.pools[pool_id]
+        self.position[index] = len(pool)
+        pool.append(index)
+        self.pool_of[index] = pool_id
+
+    def occupy(self, index):
+        if self.pool_of[index] != self.OCCUPIED:
+            self._remove(index)
+            self.pool_of[index] = self.OCCUPIED
+
+    def release(self, index):
+        if self.pool_of[index] == self.OCCUPIED:
+            self._add(index, self.REVEALED if self.revealed[self.piece_of[index]] else self.HIDDEN)
+
+    def reveal(self, piece):
+        """Moves the free cells of a newly revealed piece into the revealed pool."""
+        if self.revealed[piece]:
+            return
+        self.revealed[piece] = 1
+        for index in self.piece_cells[piece]:
+            if self.pool_of[index] == self.HIDDEN:
+                self._remove(index)
+                self._add(index, self.REVEALED)
+
+    def sample(self, rng):
+        """Returns a uniformly random free cell, from hidden pieces when any are left."""
+        pool = self.pools[self.HIDDEN] or self.pools[self.REVEALED]
+        if not pool:
+            return None
+        index = pool[rng.randrange(len(pool))]
+        return (index % self.cols, index // self.cols)
+
+
+class SnakeEngine:
+    """Pure game rules: movement, collisions, fruit, album pieces and scoring."""
+
+    def __init__(self, width, height, grid_size, album_grid_size,
+                 start_speed, speed_increment, max_speed, seed=None):
+        self.width = width
+        self.height = height
+        self.cols = width // grid_size
+        self.rows = height // grid_size
+        self.grid_size = grid_size
+        self.album_grid_size = album_grid_size
+        self.cells_per_piece = album_grid_size // grid_size
+        self.total_pieces = (width // album_grid_size) * (height // album_grid_size)
+        self.start_speed = start_speed
+        self.speed_increment = speed_increment
+        self.max_speed = max_speed
+        self.seed = seed
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        """Puts the snake back at the start position and reseeds the fruit RNG."""
+        if seed is not None:
+            self.seed = seed
+        self.rng = random.Random(self.seed)
+        head = (self.cols // 2, self.rows // 2)
+        self.body = SnakeBody(self.cols, self.rows,
+                              [(head[0] - i, head[1]) for i in range(START_LENGTH)])
+        self.free_cells = FreeCellIndex(self.cols, self.rows, self.cells_per_piece)
+        for cell in self.body:
+            self.free_cells.occupy(self.body.index(cell))
+        self.direction = RIGHT
+        self.score = 0
+        self.speed = self.start_speed
+        self.tick = 0
+        self.revealed_pieces = set()
+        self.alive = True
+        self.won = False
+        self.fruit = self._spawn_fruit()
+
+    @property
+    def head(self):
+        return self.body.head
+
+    def piece_of(self, cell):
+        """Returns the album grid position that contains a board cell."""
+        return (cell[0] // self.cells_per_piece, cell[1] // self.cells_per_piece)
+
+    def turn(self, direction):
+        """Changes direction unless it would reverse the snake onto itself."""
+        if direction in DIRECTION_VECTORS and direction != OPPOSITE_DIRECTIONS[self.direction]:
+            self.direction = direction
+
+    def step(self, direction=None):
+        """Advances the simulation by one tick and returns the events it produced."""
+        if not self.alive:
+            return [(GAME_OVER, self.score)]
+        if direction is not None:
+            self.turn(direction)
+
+        self.tick += 1
+        events = []
+        dx, dy = DIRECTION_VECTORS[self.direction]
+        head = (self.body.head[0] + dx, self.body.head[1] + dy)
+        if not self.body.in_bounds(head):
+            self.alive = False
+            events.append((GAME_OVER, self.score))
+            return events
+        hit_self = self.body.advance(head)
+        if self.body.vacated is not None:
+            self.free_cells.release(self.body.index(self.body.vacated))
+        self.free_cells.occupy(self.body.index(head))
+
+        if head == self.fruit:
+            self.score += FRUIT_POINTS
+            events.append((FRUIT_EATEN, head))
+            piece = self.piece_of(head)
+            if piece not in self.revealed_pieces:
+                self.revealed_pieces.add(piece)
+                self.free_cells.reveal(self.free_cells.piece_of[self.body.index(head)])
+                events.append((PIECE_REVEALED, piece))
+
+            if len(self.revealed_pieces) >= self.total_pieces:
+                self.alive = False
+                self.won = True
+                events.append((GAME_WON, self.score))
+                return events
+
+            self.fruit = self._spawn_fruit()
+
+            if self.score % SPEED_UP_EVERY == 0:
+                self.speed = min(self.speed + self.speed_increment, self.max_speed)
+                events.append((SPEED_UP, self.speed))
+
+        if hit_self:
+            self.alive = False
+            events.append((GAME_OVER, self.score))
+
+        return events
+
+    def _spawn_fruit(self):
+        """Picks a random free cell, preferring album pieces that are still hidden."""
+        return self.free_cells.sample(self.rng)
@@ -0,0 +1,82 @@
+import time
+import pygame
+from shared_constants import *
+from text_cache import get_font
+
+# Animated sprites are prebuilt once (scaled and converted to the display
+# format) and then picked by phase, so frame loops never call
+# pygame.transform or font.render for them.
+
+FRUIT_PULSE_SIZES = (0, 5)
+FRUIT_PULSE_INTERVAL = 0.5
+CURSOR_BLINK_INTERVAL = 0.5
+LOADING_DOTS_INTERVAL = 0.5
+
+_animations = {}
+
+
+class SpriteAnimation:
+    """A looping list of prebuilt frames that advances every interval seconds."""
+
+    def __init__(self, frames, interval):
+        self.frames = frames
+        self.interval = interval
+        self.start_time = time.monotonic()
+
+    def restart(self):
+        self.start_time = time.monotonic()
+
+    def phase(self, now=None):
+        """Returns the index of the frame to show at the given monotonic time."""
+        if now is None:
+            now = time.monotonic()
+        return int((now - self.start_time) / self.interval) % len(self.frames)
+
+    def frame(self, now=None):
+        return self.frames[self.phase(now)]
+
+
+def _build_fruit_animation():
+    frames = []
+    for pulse in FRUIT_PULSE_SIZES:
+        if fruit_image is None:
+            frames.append(None)
+        else:
+            size = (GRID_SIZE + pulse, GRID_SIZE + pulse)
+            frames.append(pygame.transform.scale(fruit_image, size).convert_alpha())
+    return SpriteAnimation(frames, FRUIT_PULSE_INTERVAL)
+
+def _build_cursor_animation(cursor_height):
+    cursor = pygame.Surface((2, cursor_height)).convert()
+    cursor.fill(BLACK)
+    return SpriteAnimation([cursor, None], CURSOR_BLINK_INTERVAL)
+
+def _build_loading_dots_animation():
+    dots_font = get_font("Press Start 2P", 30)
+    frames = [dots_font.render(dots, True, LIGHT_BLUE).convert_alpha() for dots in ("", ".", "..", "...")]
+    return SpriteAnimation(frames, LOADING_DOTS_INTERVAL)
+
+def get_animation(name, *args):
+    """Returns a prebuilt animation, building it on first request.
+
+    Frames are converted to the display format, so this must only be called
+    once the display mode has been set.
+    """
+    key = (name,) + args
+    animation = _animations.get(key)
+    if animation is None:
+        if name == "fruit":
+            animation = _build_fruit_animation()
+        elif name == "cursor":
+            animation = _build_cursor_animation(*args)
+        elif name == "loading_dots":
+            animation = _build_loading_dots_animation()
+        else:
+            raise KeyError(name)
+        _animations[key] = animation
+    return animation
+
+def load_animations():
+    """Prebuilds the animations that do not depend on runtime sizes."""
+    get_animation("fruit")
+    get_animation("loading_dots")
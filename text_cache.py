@@ -0,0 +1,58 @@
+import pygame
+from collections import OrderedDict
+
+# Fonts are resolved once per (name, size) and rendered text surfaces are
+# kept in an LRU keyed by everything that affects their pixels, so screens
+# that redraw the same strings every frame stop paying for font.render.
+
+TEXT_CACHE_SIZE = 256
+
+_fonts = {}
+_text_surfaces = OrderedDict()
+
+
+def get_font(name, size):
+    """Returns the SysFont for a name and size, creating it only the first time."""
+    key = (name, size)
+    font = _fonts.get(key)
+    if font is None:
+        font = pygame.font.SysFont(name, size)
+        _fonts[key] = font
+    return font
+
+def _cached_surface(key, build):
+    surface = _text_surfaces.get(key)
+    if surface is not None:
+        _text_surfaces.move_to_end(key)
+        return surface
+    surface = build()
+    _text_surfaces[key] = surface
+    if len(_text_surfaces) > TEXT_CACHE_SIZE:
+        _text_surfaces.popitem(last=False)
+    return surface
+
+def render_text(text_str, font, color):
+    """Renders antialiased text, reusing the surface if it was rendered recently."""
+    return _cached_surface(("plain", text_str, font, color),
+                           lambda: font.render(text_str, True, color))
+
+def render_text_with_outline(text_str, font, main_color, outline_color, thickness):
+    """Renders text with a specified outline color and thickness."""
+    def build():
+        text_surface_outline = font.render(text_str, True, outline_color)
+        text_surface_main = font.render(text_str, True, main_color)
+
+        final_width = text_surface_main.get_width() + 2 * thickness
+        final_height = text_surface_main.get_height() + 2 * thickness
+        final_surface = pygame.Surface((final_width, final_height), pygame.SRCALPHA)
+
+        positions = [
+            (-thickness, -thickness), ( thickness, -thickness), (-thickness,  thickness), ( thickness,  thickness),
+            (-thickness, 0), (thickness, 0), (0, -thickness), (0, thickness)
+        ]
+        for dx, dy in positions:
+            final_surface.blit(text_surface_outline, (thickness + dx, thickness + dy))
+        final_surface.blit(text_surface_main, (thickness, thickness))
+        return final_surface
+
+    return _cached_surface(("outline", text_str, font, main_color, outline_color, thickness), build)
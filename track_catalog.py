@@ -0,0 +1,131 @@
+import asyncio
+import os
+import random
+import time
+from collections import OrderedDict
+from backend_client import backend
+
+# Album track lists, held in process as Track objects keyed by album id.
+# A list is fresh for TRACK_CATALOG_TTL seconds; after that it is still
+# served immediately while one background fetch replaces it, so a song
+# change never waits on the network once the album has been loaded. The
+# least recently used albums are dropped beyond TRACK_CATALOG_SIZE.
+
+TRACK_CATALOG_TTL = float(os.environ.get("SPOTISNAKE_TRACK_CATALOG_TTL", 3600))
+TRACK_CATALOG_SIZE = 32
+SNIPPET_TAIL_MS = 30000
+
+
+def album_id_from_uri(album_uri):
+    if album_uri.startswith('spotify:album:'):
+        return album_uri.replace('spotify:album:', '')
+    return album_uri
+
+
+class Track:
+    """One playable album track."""
+
+    __slots__ = ("uri", "name", "artist", "duration_ms")
+
+    def __init__(self, uri, name, artist, duration_ms):
+        self.uri = uri
+        self.name = name
+        self.artist = artist
+        self.duration_ms = duration_ms
+
+    @classmethod
+    def from_item(cls, item):
+        """Builds a Track from a Spotify track item, or returns None if it can't be played."""
+        if not isinstance(item, dict) or not item.get('uri'):
+            return None
+        artists = item.get('artists') or [{}]
+        return cls(item['uri'], item.get('name', 'Unknown Track'),
+                   artists[0].get('name', 'Unknown Artist'), item.get('duration_ms', 0) or 0)
+
+    def random_position(self):
+        """A start position that leaves at least the last 30 seconds to play."""
+        return random.randint(0, max(0, self.duration_ms - SNIPPET_TAIL_MS))
+
+
+async def fetch_album_tracks(album_id):
+    """Fetches an album's tracks from the backend, or returns None on failure."""
+    path = f"/album_tracks?album_id={album_id}"
+    response = await backend.get(path)
+    tracks_data = response.json() if response.ok else None
+    # Spotify errors can come back as a JSON body with their own status
+    if not isinstance(tracks_data, dict) or tracks_data.get('status', 200) != 200:
+        print(f"DEBUG: track_catalog.py - Album tracks failed with status {response.status}: {response.text[:200]}")
+        return None
+    tracks = [Track.from_item(item) for item in tracks_data.get('items', [])]
+    return tuple(track for track in tracks if track is not None)
+
+
+class TrackCatalog:
+    """LRU of album track lists with a TTL and stale-while-revalidate refreshes."""
+
+    def __init__(self, fetch=fetch_album_tracks, ttl=TRACK_CATALOG_TTL, max_albums=TRACK_CATALOG_SIZE):
+        self.fetch = fetch
+        self.ttl = ttl
+        self.max_albums = max_albums
+        self.albums = OrderedDict()
+        self.refreshes = {}
+
+    def get_cached(self, album_uri):
+        """Returns the album's tracks from memory (possibly stale), or None; never waits on the network."""
+        album_id = album_id_from_uri(album_uri)
+        entry = self.albums.get(album_id)
+        if entry is None:
+            return None
+        self.albums.move_to_end(album_id)
+        fetched_at, tracks = entry
+        if time.monotonic() - fetched_at >= self.ttl:
+            self._refresh(album_id)
+        return tracks
+
+    async def get(self, album_uri):
+        """Returns the album's tracks, fetching them only if the album isn't in memory.
+
+        An empty tuple means the tracks couldn't be loaded.
+        """
+        tracks = self.get_cached(album_uri)
+        if tracks is not None:
+            return tracks
+        # Concurrent callers wait on the same fetch; a cancelled caller leaves it running
+        return await asyncio.shield(self._refresh(album_id_from_uri(album_uri)))
+
+    def _refresh(self, album_id):
+        refresh = self.refreshes.get(album_id)
+        if refresh is None:
+            refresh = asyncio.ensure_future(self._load(album_id))
+            self.refreshes[album_id] = refresh
+        return refresh
+
+    async def _load(self, album_id):
+        try:
+            tracks = await self.fetch(album_id)
+        except Exception as e:
+            print(f"DEBUG: track_catalog.py - Could not load tracks for album {album_id}: {e}")
+            tracks = None
+        finally:
+            del self.refreshes[album_id]
+
+        if tracks:
+            tracks = tuple(tracks)
+            self.albums[album_id] = (time.monotonic(), tracks)
+            self.albums.move_to_end(album_id)
+            while len(self.albums) > self.max_albums:
+                self.albums.popitem(last=False)
+            return tracks
+        # A failed refresh keeps serving the old list rather than nothing
+        entry = self.albums.get(album_id)
+        return entry[1] if entry is not None else ()
+
+    def invalidate(self, album_uri=None):
+        """Forgets one album's tracks, or every album's."""
+        if album_uri is None:
+            self.albums.clear()
+        else:
+            self.albums.pop(album_id_from_uri(album_uri), None)
+
+
+track_catalog = TrackCatalog()
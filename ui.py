@@ -6,13 +6,17 @@ import sys
 import os
 import time
 from shared_constants import *
+from text_cache import get_font, render_text
+from sprites import load_animations
+from scene_manager import Scene, run_scenes
 from spotipy_handling import (
     get_album_search_input, cleanup, get_spotify_device, safe_pause_playback, backend_login, check_authenticated, play_uri_with_details, play_track_via_backend
 )
 
 screen = pygame.display.set_mode((width, height))
 pygame.display.set_caption("SpotiSnake - Start Menu")
-font = pygame.font.SysFont("Press Start 2P", 25)
+load_animations()
+font = get_font("Press Start 2P", 25)
 
 async def quit_game_async(dummy_arg=None):
     """Handles game shutdown: pauses Spotify, cleans up, and exits properly."""
@@ -47,8 +51,8 @@ async def login_screen():
     error_message = None
     error_timer = 0
     is_authenticating = False
-    title_font = pygame.font.SysFont("Press Start 2P", 55)
-    small_font = pygame.font.SysFont("Press Start 2P", 20)
+    title_font = get_font("Press Start 2P", 55)
+    small_font = get_font("Press Start 2P", 20)
     instructions = [
         "Click to login with Spotify",
         "Browser will open for log-in", 
@@ -63,16 +67,16 @@ async def login_screen():
         screen.blit(game_bg, (0, 0))
     else:
         screen.fill(DARK_GREY)
-    title = title_font.render("Welcome to SpotiSnake!", True, BLACK)
+    title = render_text("Welcome to SpotiSnake!", title_font, BLACK)
     screen.blit(title, (width//2 - title.get_width()//2, height//4))
     button_color = LIGHT_BLUE
     pygame.draw.rect(screen, button_color, login_button)
-    text_surf = font.render(current_login_text, True, BLACK)
+    text_surf = render_text(current_login_text, font, BLACK)
     text_rect = text_surf.get_rect(center=login_button.center)
     screen.blit(text_surf, text_rect)
     y_offset = height//2 + 50
     for instruction in instructions:
-        text = small_font.render(instruction, True, WHITE)
+        text = render_text(instruction, small_font, WHITE)
         screen.blit(text, (width//2 - text.get_width()//2, y_offset))
         y_offset += 40
     pygame.display.flip()
@@ -89,14 +93,14 @@ async def login_screen():
                     is_authenticating = True
                     current_login_text = "Opening login..."
                     pygame.draw.rect(screen, DARK_BLUE, login_button)
-                    text_surf_auth = font.render(current_login_text, True, BLACK)
+                    text_surf_auth = render_text(current_login_text, font, BLACK)
                     text_rect_auth = text_surf_auth.get_rect(center=login_button.center)
                     screen.blit(text_surf_auth, text_rect_auth)
                     pygame.display.flip()
                     try:
                         backend_login()
                         
-                        wait_title = small_font.render("Complete login in the opened tab...", True, WHITE)
+                        wait_title = render_text("Complete login in the opened tab...", small_font, WHITE)
                         waiting = True
                         last_check = 0
                         start_time = time.time()
@@ -115,7 +119,7 @@ async def login_screen():
                             else:
                                 screen.fill(DARK_GREY)
                             screen.blit(wait_title, (width//2 - wait_title.get_width()//2, height//2 - 10))
-                            hint = small_font.render("Return here after confirming login", True, WHITE)
+                            hint = render_text("Return here after confirming login", small_font, WHITE)
                             screen.blit(hint, (width//2 - hint.get_width()//2, height//2 + 20))
                             pygame.display.flip()
                             now = time.time()
@@ -138,20 +142,20 @@ async def login_screen():
             screen.blit(game_bg, (0, 0))
         else:
             screen.fill(DARK_GREY)
-        title = title_font.render("Welcome to SpotiSnake!", True, BLACK)
+        title = render_text("Welcome to SpotiSnake!", title_font, BLACK)
         screen.blit(title, (width//2 - title.get_width()//2, height//4))
         button_color = DARK_BLUE if is_authenticating else LIGHT_BLUE
         pygame.draw.rect(screen, button_color, login_button)
-        text_surf = font.render(current_login_text, True, BLACK)
+        text_surf = render_text(current_login_text, font, BLACK)
         text_rect = text_surf.get_rect(center=login_button.center)
         screen.blit(text_surf, text_rect)
         y_offset = height//2 + 50
         for instruction in instructions:
-            text = small_font.render(instruction, True, WHITE)
+            text = render_text(instruction, small_font, WHITE)
             screen.blit(text, (width//2 - text.get_width()//2, y_offset))
             y_offset += 40
         if error_message and time.time() - error_timer < 5:
-            error_surf = small_font.render(error_message, True, RED)
+            error_surf = render_text(error_message, small_font, RED)
             screen.blit(error_surf, (width//2 - error_surf.get_width()//2, height - 50))
         pygame.display.flip()
         clock.tick(30)
@@ -168,7 +172,6 @@ async def main_menu():
     except Exception:
         pass
     
-    running = True
     button_play_text = "PLAY GAME"
 
     button_width = 200
@@ -180,7 +183,7 @@ async def main_menu():
 
     button_clicked = False
 
-    while running:
+    while True:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 await quit_game_async()
@@ -191,9 +194,7 @@ async def main_menu():
                 if play_button_rect.collidepoint(mouse_pos):
                     button_clicked = True
                     pygame.time.delay(200)
-                    running = False
-                    await start_game(screen)
-                    break
+                    return Scene(start_game, screen)
         
         if start_menu_bg:
             screen.blit(start_menu_bg, (0, 0))
@@ -209,7 +210,7 @@ async def main_menu():
         else:
             pygame.draw.rect(screen, LIGHT_BLUE, play_button_rect)
         
-        play_text_surf = font.render(button_play_text, True, BLACK)
+        play_text_surf = render_text(button_play_text, font, BLACK)
         play_text_rect = play_text_surf.get_rect(center=play_button_rect.center)
         screen.blit(play_text_surf, play_text_rect)
 
@@ -218,10 +219,9 @@ async def main_menu():
         await asyncio.sleep(0)
 
 async def start_menu():
-    """Displays the start menu, handles login, and starts the game or quits."""
+    """Displays the start menu, handles login, and hands over to the main menu or quits."""
     clock = pygame.time.Clock()
     
-    is_authenticated = await check_authenticated()
     # Force login screen every time to avoid authentication/cookie issues
     is_authenticated = False
     if not is_authenticated:
@@ -235,8 +235,8 @@ async def start_menu():
     except Exception:
         pass
     
-    await main_menu()
+    return Scene(main_menu)
 
 async def main():
     """Main asynchronous entry point for the application UI (intended to be called from main.py)."""
-    await start_menu()
\ No newline at end of file
+    await run_scenes(Scene(start_menu))
\ No newline at end of file